@@ -1,13 +1,42 @@
-from typing import Optional, Tuple, Dict
+from typing import BinaryIO, Optional, Tuple, Dict
 import concurrent.futures
+import csv
+import io
+from itertools import islice
 from pathlib import Path
 
-import chardet
+from chardet.universaldetector import UniversalDetector
 import pandas as pd
+import pyarrow.csv as pa_csv
 
 from scripts.csv_to_markdown.utils import load_config
 
 
+def _detect_encoding_stream(stream: BinaryIO) -> Optional[str]:
+    """
+    Detect the encoding of a binary stream and rewind it.
+
+    The stream is fed to the detector in 64 KiB chunks and detection stops as
+    soon as the detector is confident, so only a small prefix of large inputs
+    is read instead of the whole content.
+
+    Args:
+        - stream (BinaryIO): A seekable binary stream positioned at the start.
+
+    Returns:
+        - Optional[str]: The detected encoding, or None if the encoding could
+            not be detected.
+    """
+    detector = UniversalDetector()
+    for chunk in iter(lambda: stream.read(65536), b""):
+        detector.feed(chunk)
+        if detector.done:
+            break
+    detector.close()
+    stream.seek(0)
+    return detector.result["encoding"]
+
+
 def detect_encoding(file_path: Path) -> Optional[str]:
     """
     Detect the encoding of a given file.
@@ -20,23 +49,34 @@ def detect_encoding(file_path: Path) -> Optional[str]:
             could not be detected.
     """
     with open(file_path, "rb") as f:
-        result = chardet.detect(f.read())
-    return result["encoding"]
+        return _detect_encoding_stream(f)
 
 
-def process_csv(
-    file_path: Path, metadata_keys: list, data_keys: list
+def process_csv_stream(
+    stream: BinaryIO,
+    name: str,
+    metadata_keys: list,
+    data_keys: list,
+    encoding: Optional[str] = None,
+    dtypes: Optional[Dict[str, str]] = None,
 ) -> Optional[Tuple[Dict[str, str], pd.DataFrame]]:
     """
-    Processes a CSV file to extract metadata and dataset content.
+    Processes a CSV stream to extract metadata and dataset content.
 
-    This function reads a CSV file, detects its encoding, and processes its content
-    to extract metadata and dataset information based on the provided keys.
+    This function reads the CSV content from a seekable binary stream (an open
+    file or an in-memory buffer, e.g. a downloaded response body), detects its
+    encoding, and processes it to extract metadata and dataset information
+    based on the provided keys.
 
     Args:
-        - file_path (Path): The path to the CSV file to be processed.
+        - stream (BinaryIO): A seekable binary stream with the CSV content.
+        - name (str): The name of the CSV file, used in log messages.
         - metadata_keys (list): A list of expected metadata keys.
         - data_keys (list): A list of expected dataset keys.
+        - encoding (Optional[str]): The encoding of the CSV content. If None,
+            the encoding is detected from the content.
+        - dtypes (Optional[Dict[str, str]]): A mapping of dataset column names
+            to pandas dtypes, applied to the dataset content after validation.
 
     Returns:
         - Optional[Tuple[Dict[str, str], pd.DataFrame]]: A tuple containing a
@@ -57,14 +97,14 @@ def process_csv(
         Returns:
             - str: The formatted message string.
         """
-        return f"[{file_path.name}] - {msg}"
+        return f"[{name}] - {msg}"
 
-    def _metatada_content(df: pd.DataFrame, key_values: list) -> Dict[str, str]:
+    def _metatada_content(rows: list, key_values: list) -> Dict[str, str]:
         """
-        Extracts metadata content from the first two columns of the given DataFrame.
+        Extracts metadata content from the first two columns of the head rows.
 
         Args:
-            - df (pd.DataFrame): The DataFrame containing the metadata.
+            - rows (list): The head rows of the CSV, as lists of cell values.
             - key_values (list): A list of expected metadata keys.
 
         Returns:
@@ -75,34 +115,35 @@ def process_csv(
             metadata keys do not match the expected keys.
         """
 
-        df_metadata = df.iloc[: len(key_values)].copy()
-        df_metadata = df_metadata.dropna(axis=1, how="all")
-        assert df_metadata.shape[1] == 2, _msg_print(
+        rows_metadata = rows[: len(key_values)]
+        filled_cols = sorted(
+            {i for row in rows_metadata for i, cell in enumerate(row) if cell != ""}
+        )
+        assert len(filled_cols) == 2, _msg_print(
             "Only the first two columns must be filled!"
         )
 
-        dict_metadata = df_metadata.set_index(0).iloc[:, 0].to_dict()
+        key_col, value_col = filled_cols
+        dict_metadata = {row[key_col]: row[value_col] for row in rows_metadata}
         assert set(dict_metadata.keys()) == set(key_values), _msg_print(
             f"Invalid metadata keys!, expected: {key_values}"
         )
         return dict_metadata
 
-    def _dataset_content(
-        df: pd.DataFrame, key_values: list, metadata_len: int
-    ) -> pd.DataFrame:
+    def _dataset_content(df: pd.DataFrame, key_values: list) -> pd.DataFrame:
         """
-        Processes a DataFrame to extract and validate dataset content.
+        Processes the dataset body rows into a validated DataFrame.
 
-        This function takes a DataFrame and a list of key values, processes the
-        DataFrame to extract the dataset content starting from the 9th row, and
-        validates that the first two columns are empty and that the remaining
-        columns match the provided key values.
+        This function takes the body rows of the CSV (dataset header row
+        first), validates that the first two columns are empty, promotes the
+        header row to column names and validates them against the provided
+        key values.
 
         Args:
-            - df (pd.DataFrame): The input DataFrame to process.
+            - df (pd.DataFrame): The dataset body rows, with the dataset
+                header as the first row.
             - key_values (list): A list of expected key values for the dataset
                 columns.
-            - metadata_len (int): The number of rows used for metadata.
 
         Returns:
             - pd.DataFrame: A processed DataFrame containing the dataset content.
@@ -111,58 +152,163 @@ def process_csv(
             - AssertionError: If the first two columns are not empty or if the
                 dataset columns do not match the provided key values.
         """
-        df_dataset = df.iloc[metadata_len:].reset_index(drop=True).copy()
-        assert df_dataset.iloc[:, :2].isnull().all().all(), _msg_print(
+        assert df.iloc[:, :2].isnull().all().all(), _msg_print(
             "First two columns must be empty!"
         )
-        df_dataset = df_dataset.iloc[:, 2:]
+        df_dataset = df.iloc[:, 2:]
         df_dataset.columns = df_dataset.iloc[0]
         assert set(df_dataset.columns) == set(key_values), _msg_print(
             f"Invalid dataset keys!, expected: {key_values}"
         )
-        df_dataset = df_dataset[1:]
-        df_dataset.reset_index(drop=True, inplace=True)
+        df_dataset = df_dataset[1:].reset_index(drop=True)
+        if dtypes:
+            df_dataset = df_dataset.astype(dtypes, copy=False)
         return df_dataset
 
-    encoding = detect_encoding(file_path)
-    print(_msg_print(f"Encoding detected: {encoding}"))
+    if encoding is None:
+        encoding = _detect_encoding_stream(stream)
+        print(_msg_print(f"Encoding detected: {encoding}"))
+    empty_rows = len(metadata_keys) + 1
+
+    # Read only the metadata head with the stdlib csv reader, so a malformed
+    # file fails fast without spinning up a full CSV parse.
     try:
-        df_raw = pd.read_csv(file_path, sep=";", encoding=encoding, header=None)
-        print(_msg_print(f"Processing {file_path}: {len(df_raw)} rows"))
+        text = io.TextIOWrapper(stream, encoding=encoding, newline="")
+        try:
+            head_rows = list(islice(csv.reader(text, delimiter=";"), empty_rows))
+        finally:
+            text.detach()
+        stream.seek(0)
     except Exception as e:
-        print(_msg_print(f"Error processing {file_path} with encoding {encoding}: {e}"))
+        print(_msg_print(f"Error processing {name} with encoding {encoding}: {e}"))
         return None
 
-    empty_rows = len(metadata_keys) + 1
-    assert df_raw.iloc[empty_rows - 1].isnull().all(), _msg_print(
-        f"Line {empty_rows} must be empty!"
-    )
-    return _metatada_content(df_raw, metadata_keys), _dataset_content(
-        df_raw, data_keys, empty_rows
+    assert len(head_rows) == empty_rows and all(
+        cell == "" for cell in head_rows[-1]
+    ), _msg_print(f"Line {empty_rows} must be empty!")
+    dict_metadata = _metatada_content(head_rows, metadata_keys)
+
+    # Parse the dataset body with pyarrow's multi-threaded native CSV reader,
+    # skipping the metadata head. Empty strings map to null so the DataFrame
+    # matches what pandas produced for empty fields.
+    try:
+        table = pa_csv.read_csv(
+            stream,
+            read_options=pa_csv.ReadOptions(
+                encoding=encoding,
+                skip_rows=empty_rows,
+                autogenerate_column_names=True,
+                block_size=1 << 26,
+            ),
+            parse_options=pa_csv.ParseOptions(delimiter=";"),
+            convert_options=pa_csv.ConvertOptions(strings_can_be_null=True),
+        )
+    except Exception as e:
+        print(_msg_print(f"Error processing {name} with encoding {encoding}: {e}"))
+        return None
+
+    df_dataset = _dataset_content(table.to_pandas(), data_keys)
+    print(_msg_print(f"Processing {name}: {len(df_dataset)} dataset rows"))
+    return dict_metadata, df_dataset
+
+
+def process_csv_bytes(
+    data: bytes,
+    name: str,
+    metadata_keys: list,
+    data_keys: list,
+    encoding: Optional[str] = None,
+    dtypes: Optional[Dict[str, str]] = None,
+) -> Optional[Tuple[Dict[str, str], pd.DataFrame]]:
+    """
+    Processes an in-memory CSV to extract metadata and dataset content.
+
+    Thin wrapper around process_csv_stream for raw bytes. Unlike an open
+    stream, bytes can be pickled, so this is the entry point for running the
+    parse in a process-pool worker.
+
+    Args:
+        - data (bytes): The CSV content.
+        - name (str): The name of the CSV file, used in log messages.
+        - metadata_keys (list): A list of expected metadata keys.
+        - data_keys (list): A list of expected dataset keys.
+        - encoding (Optional[str]): The encoding of the CSV content. If None,
+            the encoding is detected from the content.
+        - dtypes (Optional[Dict[str, str]]): A mapping of dataset column names
+            to pandas dtypes, applied to the dataset content after validation.
+
+    Returns:
+        - Optional[Tuple[Dict[str, str], pd.DataFrame]]: A tuple containing a
+            dictionary with metadata key-value pairs and a DataFrame with the
+            dataset content. Returns None if there is an error processing the file.
+
+    Raises:
+        - AssertionError: If the CSV file format does not meet the expected structure.
+    """
+    return process_csv_stream(
+        io.BytesIO(data), name, metadata_keys, data_keys, encoding, dtypes
     )
 
 
+def process_csv(
+    file_path: Path,
+    metadata_keys: list,
+    data_keys: list,
+    encoding: Optional[str] = None,
+    dtypes: Optional[Dict[str, str]] = None,
+) -> Optional[Tuple[Dict[str, str], pd.DataFrame]]:
+    """
+    Processes a CSV file to extract metadata and dataset content.
+
+    Thin wrapper around process_csv_stream for CSV files on disk.
+
+    Args:
+        - file_path (Path): The path to the CSV file to be processed.
+        - metadata_keys (list): A list of expected metadata keys.
+        - data_keys (list): A list of expected dataset keys.
+        - encoding (Optional[str]): The encoding of the CSV file. If None, the
+            encoding is detected from the file content.
+        - dtypes (Optional[Dict[str, str]]): A mapping of dataset column names
+            to pandas dtypes, applied to the dataset content after validation.
+
+    Returns:
+        - Optional[Tuple[Dict[str, str], pd.DataFrame]]: A tuple containing a
+            dictionary with metadata key-value pairs and a DataFrame with the
+            dataset content. Returns None if there is an error processing the file.
+
+    Raises:
+        - AssertionError: If the CSV file format does not meet the expected structure.
+    """
+    with open(file_path, "rb") as stream:
+        return process_csv_stream(
+            stream, file_path.name, metadata_keys, data_keys, encoding, dtypes
+        )
+
+
 if __name__ == "__main__":
 
     CSV_FOLDER = "data/vlc"
     config_yml = load_config(Path("scripts/csv_to_markdown/config.yaml"))
     METADATA_KEYS = list(config_yml["metadata"].keys())
     DATA_KEYS = config_yml["dataset"]
+    DEFAULT_ENCODING = config_yml.get("default_encoding")
+    DATASET_DTYPES = config_yml.get("dataset_dtypes")
 
     path = Path(CSV_FOLDER)
     lst_files = list(path.glob("*.csv"))
 
     with concurrent.futures.ThreadPoolExecutor() as executor:
-        results = {
-            file_path.name: result
-            for file_path, result in zip(
-                lst_files,
+        results = dict(
+            zip(
+                (file_path.name for file_path in lst_files),
                 executor.map(
-                    lambda file_path: process_csv(file_path, METADATA_KEYS, DATA_KEYS),
+                    lambda file_path: process_csv(
+                        file_path, METADATA_KEYS, DATA_KEYS, DEFAULT_ENCODING, DATASET_DTYPES
+                    ),
                     lst_files,
                 ),
             )
-        }
+        )
 
     # print("Results:", results)
     print("All files processed.")
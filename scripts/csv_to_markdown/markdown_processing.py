@@ -1,11 +1,17 @@
 from pathlib import Path
 import concurrent.futures
 import re
+import numpy as np
 import pandas as pd
 
 from scripts.csv_to_markdown.utils import load_config
 from scripts.csv_to_markdown.csv_processing import process_csv
 
+# A markdown table line, compiled once instead of per line checked
+_TABLE_LINE_RE = re.compile(r"^\|.*\|$")
+# A single line including its trailing newline (or the last line without one)
+_LINE_RE = re.compile(r".*\n|.+")
+
 
 class MarkdownTable:
     """
@@ -13,9 +19,9 @@ class MarkdownTable:
 
     Attributes:
         - md_content (str): The content of the markdown file.
-        - lines (list): The list of lines of the markdown file.
-        - idx_range_table (dict): A dictionary with the start and end indices of
-            the table.
+        - head (str): The content before the table, including the header row.
+        - body (list): The lines of the table after the header row.
+        - tail (str): The content after the table.
         - table_columns (list): A list of column names in the markdown table.
 
     Properties:
@@ -37,12 +43,18 @@ class MarkdownTable:
 
     def __init__(self, md_pth: Path, n_tables: int = 0) -> None:
         self.md_content = self._read_md_file(md_pth)
-        self.lines = self.md_content.splitlines("\n")
-
-        idx_range_table = self._find_tables(self.md_content)[n_tables]
-        self.idx_range_table = {"start": idx_range_table[0], "end": idx_range_table[1]}
-
-        table_header = self.lines[self.idx_range_table["start"]].strip()
+        start_off, end_off = self._find_tables(self.md_content)[n_tables]
+
+        # Everything outside the table is kept as two plain string slices of
+        # the original content; only the table rows live in a small list, so
+        # edits never re-split or shift the rest of the document.
+        header_end = self.md_content.find("\n", start_off, end_off)
+        header_end = end_off if header_end == -1 else header_end + 1
+        self.head = self.md_content[:header_end]
+        self.body = self.md_content[header_end:end_off].splitlines(keepends=True)
+        self.tail = self.md_content[end_off:]
+
+        table_header = self.md_content[start_off:header_end].strip()
         self.table_columns = self._md_table_to_lst(table_header)
 
     def _read_md_file(self, md_pth: Path) -> str:
@@ -60,55 +72,48 @@ class MarkdownTable:
 
     def _find_tables(self, md_file: str) -> list:
         """
-        Find tables in a Markdown file and return a list of tuples with the start and end lines.
+        Find tables in a Markdown file and return a list of tuples with the
+        start and end character offsets of each table within the content.
 
         Args:
             - md_content (str): The content of the Markdown file.
 
         Returns:
-            - list: A list of tuples with the start and end lines of each table.
+            - list: A list of tuples with the (start, end) character offsets
+                of each table.
         """
 
-        def _is_table_line(line: str) -> bool:
-            """
-            Check if a given line is a markdown table line.
-
-            Args:
-                - line (str): The line to check.
-
-            Returns:
-                - bool: True if the line is a markdown table line, False otherwise.
-            """
-            return re.match(r"^\|.*\|$", line.strip())
-
-        lines = md_file.splitlines("\n")
-
-        table_lines = list(map(_is_table_line, lines))
-        indices = range(len(lines))
-
-        start_indices = [
-            i for i in indices if table_lines[i] and (i == 0 or not table_lines[i - 1])
+        # Scan the content line by line without materializing a full copy of
+        # it as a list of lines; only the line spans and flags are kept.
+        spans = []
+        flags = []
+        for match in _LINE_RE.finditer(md_file):
+            spans.append((match.start(), match.end()))
+            flags.append(_TABLE_LINE_RE.match(match.group().strip()) is not None)
+
+        # Recover each run of consecutive flags from the edges of the padded
+        # boolean array: even edges are run starts, odd edges are one past
+        # the run ends.
+        table_lines = np.array(flags, dtype=bool)
+        padded = np.r_[False, table_lines, False]
+        edges = np.flatnonzero(padded[1:] != padded[:-1])
+
+        return [
+            (spans[start][0], spans[end - 1][1])
+            for start, end in zip(edges[0::2].tolist(), edges[1::2].tolist())
         ]
-        end_indices = [
-            i
-            for i in indices
-            if table_lines[i] and (i == len(lines) - 1 or not table_lines[i + 1])
-        ]
-
-        return list(zip(start_indices, end_indices))
 
-    def _md_table_to_lst(self, table_row: str, sep: str = "|") -> list:
+    def _md_table_to_lst(self, table_row: str) -> list:
         """
         Converts a markdown table row into a list of cell values.
 
         Args:
             - table_row (str): A string representing a row in a markdown table.
-            - sep (str, optional): The separator used in the markdown table. Defaults to "|".
 
         Returns:
             - list: A list of cell values with leading and trailing whitespace removed.
         """
-        return list(map(lambda x: x.strip(), table_row.split(sep)[1:-1]))
+        return [cell.strip() for cell in table_row.split("|")[1:-1]]
 
     @property
     def get_markdown(self) -> str:
@@ -118,7 +123,7 @@ class MarkdownTable:
         Returns:
             - str: The concatenated markdown string.
         """
-        return "".join(self.lines)
+        return self.head + "".join(self.body) + self.tail
 
     @property
     def get_lines(self) -> list:
@@ -128,7 +133,11 @@ class MarkdownTable:
         Returns:
             - list: The list of lines of the markdown file.
         """
-        return self.lines
+        return (
+            self.head.splitlines(keepends=True)
+            + self.body
+            + self.tail.splitlines(keepends=True)
+        )
 
     def add_new_row(self, new_values: dict) -> None:
         """
@@ -148,12 +157,11 @@ class MarkdownTable:
 
         new_row = (
             "| "
-            + " | ".join([new_values.get(col, "") for col in self.table_columns])
+            + " | ".join(new_values.get(col, "") for col in self.table_columns)
             + " |\n"
         )
 
-        self.idx_range_table["end"] += 1
-        self.lines.insert(self.idx_range_table["end"], new_row)
+        self.body.append(new_row)
 
     def modify_cell(self, column_name: str, idx_row_edit: int, new_value: str):
         """
@@ -178,13 +186,9 @@ class MarkdownTable:
         ), f"Column '{column_name}' not found in table columns: {self.table_columns}"
         column_index = self.table_columns.index(column_name)
 
-        table_row = self._md_table_to_lst(
-            self.lines[self.idx_range_table["start"] + idx_row_edit]
-        )
+        table_row = self._md_table_to_lst(self.body[idx_row_edit - 1])
         table_row[column_index] = f" {new_value} "
-        self.lines[self.idx_range_table["start"] + idx_row_edit] = (
-            "| " + " | ".join(table_row) + " |\n"
-        )
+        self.body[idx_row_edit - 1] = "| " + " | ".join(table_row) + " |\n"
 
 
 def markdown_page(
@@ -223,6 +227,8 @@ if __name__ == "__main__":
 
     METADATA_KEYS = list(config_yml["metadata"].keys())
     DATA_KEYS = config_yml["dataset"]
+    DEFAULT_ENCODING = config_yml.get("default_encoding")
+    DATASET_DTYPES = config_yml.get("dataset_dtypes")
     METADATA_TABLE_MD = dict(
         filter(
             lambda item: item[0],
@@ -237,16 +243,17 @@ if __name__ == "__main__":
     path = Path(CSV_FOLDER)
     lst_files = list(path.glob("*.csv"))
     with concurrent.futures.ThreadPoolExecutor() as executor:
-        csv_processed = {
-            file_path.name: result
-            for file_path, result in zip(
-                lst_files,
+        csv_processed = dict(
+            zip(
+                (file_path.name for file_path in lst_files),
                 executor.map(
-                    lambda file_path: process_csv(file_path, METADATA_KEYS, DATA_KEYS),
+                    lambda file_path: process_csv(
+                        file_path, METADATA_KEYS, DATA_KEYS, DEFAULT_ENCODING, DATASET_DTYPES
+                    ),
                     lst_files,
                 ),
             )
-        }
+        )
 
     # Markdown processing
     for file_name, (metadata, df) in csv_processed.items():
@@ -1,13 +1,43 @@
 from typing import Dict
+from functools import lru_cache
+import shutil
 import yaml
+
+try:
+    # libyaml-backed loader, noticeably faster than the pure-Python fallback
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pathlib import Path
 
+# Shared session so every download reuses pooled Keep-Alive connections
+# instead of paying a new TCP+TLS handshake per file. requests.Session is
+# thread-safe for concurrent GETs, so it can be shared across executor workers.
+# pool_block makes workers wait for a pooled connection instead of opening
+# throwaway unpooled ones when more than pool_maxsize requests are in flight.
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    pool_block=True,
+    max_retries=Retry(total=3, backoff_factor=0.2),
+)
+_SESSION.mount("https://", _ADAPTER)
+_SESSION.mount("http://", _ADAPTER)
 
+
+@lru_cache(maxsize=None)
 def load_config(config_path: Path) -> Dict[str, Dict]:
     """
     Load configuration from a YAML file.
 
+    The result is cached per path, so repeated calls within a process parse
+    the YAML file only once.
+
     Args:
         - config_path (Path): The path to the YAML configuration file.
 
@@ -15,7 +45,7 @@ def load_config(config_path: Path) -> Dict[str, Dict]:
         - Dict[str, Dict]: A dictionary with configuration keys and values.
     """
     with open(config_path, "r") as file:
-        config = yaml.safe_load(file)
+        config = yaml.load(file, Loader=_YamlLoader)
     return config
 
 
@@ -23,6 +53,10 @@ def download_file(url: str, download_dir: Path, headers: dict = None) -> Path:
     """
     Downloads a file from the given URL and saves it to the specified directory.
 
+    The server's ETag is persisted next to the file; when a copy already
+    exists and a HEAD request reports the same ETag, the body download is
+    skipped entirely and the existing file is returned.
+
     Args:
         - url (str): The URL of the file to download.
         - download_dir (Path): The directory where the downloaded file will be saved.
@@ -36,9 +70,47 @@ def download_file(url: str, download_dir: Path, headers: dict = None) -> Path:
         - requests.exceptions.HTTPError: If the HTTP request returned an
             unsuccessful status code.
     """
-    response = requests.get(url, headers)
-    response.raise_for_status()
     file_path = download_dir / Path(url).name
+    etag_path = file_path.with_suffix(file_path.suffix + ".etag")
+
+    if file_path.exists() and etag_path.exists():
+        head = _SESSION.head(url, headers=headers, timeout=30, allow_redirects=True)
+        etag = head.headers.get("ETag")
+        if head.ok and etag and etag_path.read_text() == etag:
+            return file_path
+
+    response = _SESSION.get(url, headers=headers, stream=True, timeout=30)
+    response.raise_for_status()
+    # Decode Content-Encoding (e.g. gzip) while streaming, so the file holds
+    # the CSV bytes rather than the compressed wire payload.
+    response.raw.decode_content = True
     with open(file_path, "wb") as file:
-        file.write(response.content)
+        shutil.copyfileobj(response.raw, file)
+
+    etag = response.headers.get("ETag")
+    if etag:
+        etag_path.write_text(etag)
+    else:
+        etag_path.unlink(missing_ok=True)
     return file_path
+
+
+def download_bytes(url: str, headers: dict = None) -> bytes:
+    """
+    Downloads a file from the given URL into memory.
+
+    Args:
+        - url (str): The URL of the file to download.
+        - headers (dict, optional): A dictionary of HTTP headers to send with the
+            request. Defaults to None.
+
+    Returns:
+        - bytes: The content of the downloaded file.
+
+    Raises:
+        - requests.exceptions.HTTPError: If the HTTP request returned an
+            unsuccessful status code.
+    """
+    response = _SESSION.get(url, headers=headers, timeout=30)
+    response.raise_for_status()
+    return response.content
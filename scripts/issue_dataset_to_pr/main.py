@@ -4,27 +4,71 @@ import re
 from pathlib import Path
 import traceback
 import concurrent.futures
+import multiprocessing
 
-from github import Github
+import requests
+import requests_cache
 
-from scripts.csv_to_markdown.utils import load_config, download_file
-from scripts.csv_to_markdown.csv_processing import process_csv
+from scripts.csv_to_markdown.utils import load_config, download_bytes
+from scripts.csv_to_markdown.csv_processing import process_csv_bytes
 from scripts.csv_to_markdown.markdown_processing import markdown_page
 
+# Markdown links pointing to CSV files, compiled once instead of on every call
+_CSV_ANY_RE = re.compile(r"\[.*?\]\((.*?\.csv)\)")
+_CSV_URL_RE = re.compile(r"\[.*?\]\((https://.*?\.csv)\)")
+
+
+def _fetch_issue_body(git_token: str, repo_name: str, issue_number: int) -> str:
+    """
+    Fetches the body of a GitHub issue with a single GraphQL query.
+
+    Args:
+        - git_token (str): The GitHub token used to authenticate the request.
+        - repo_name (str): The repository in "owner/name" form.
+        - issue_number (int): The number of the issue to fetch.
+
+    Returns:
+        - str: The body of the issue.
+
+    Raises:
+        - requests.exceptions.HTTPError: If the HTTP request returned an
+            unsuccessful status code.
+        - AssertionError: If the GraphQL response contains errors.
+    """
+    owner, name = repo_name.split("/", 1)
+    query = (
+        "query($owner: String!, $name: String!, $number: Int!) {"
+        " repository(owner: $owner, name: $name) {"
+        " issue(number: $number) { body } } }"
+    )
+    response = requests.post(
+        "https://api.github.com/graphql",
+        headers={"Authorization": f"bearer {git_token}"},
+        json={
+            "query": query,
+            "variables": {"owner": owner, "name": name, "number": issue_number},
+        },
+        timeout=30,
+    )
+    response.raise_for_status()
+    payload = response.json()
+    assert "errors" not in payload, f"GraphQL errors: {payload['errors']}"
+    return payload["data"]["repository"]["issue"]["body"]
+
 
 def main(git_token: str, repo_name: str, issue_number: str, config_yml: dict):
 
-    def _csv_processing(
-        urls: list, cfg_yml: dict, csv_path: Path, header: dict = None
-    ) -> dict:
+    def _csv_processing(urls: list, cfg_yml: dict, header: dict = None) -> dict:
         """
         Downloads and processes CSV files based on provided URLs and configuration.
 
+        Each CSV is downloaded into memory and parsed straight from the
+        response bytes, so no intermediate copy is written to disk.
+
         Args:
             - urls (list): List of URLs pointing to the CSV files to be downloaded.
             - cfg_yml (dict): Configuration dictionary containing metadata and dataset keys.
-            - csv_path (Path): Path to the directory where the CSV files will be downloaded.
-             - header (dict, optional): Optional headers to include in the download request.
+            - header (dict, optional): Optional headers to include in the download request.
 
         Returns:
             - dict: A dictionary where keys are the names of the CSV files and
@@ -33,27 +77,50 @@ def main(git_token: str, repo_name: str, issue_number: str, config_yml: dict):
         # Metadata and data keys
         METADATA_KEYS = list(cfg_yml["metadata"].keys())
         DATA_KEYS = cfg_yml["dataset"]
-
-        # Download the CSV in temporary folder
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            csv_url_to_path = {
-                file_path: download_file(file_path, csv_path, header)
-                for file_path in urls
-            }
-        csv_files = list(csv_url_to_path.values())
-
-        # Process the CSV file
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            results = {
-                file_path.name: result
-                for file_path, result in zip(
-                    csv_files,
-                    executor.map(
-                        lambda f_pth: process_csv(f_pth, METADATA_KEYS, DATA_KEYS),
-                        csv_files,
-                    ),
+        DEFAULT_ENCODING = cfg_yml.get("default_encoding")
+        DATASET_DTYPES = cfg_yml.get("dataset_dtypes")
+
+        # The csv-link assertion in main() also accepts non-https links, so
+        # the downloadable URL list can legitimately be empty here; bail out
+        # before sizing the pools (max_workers must be > 0).
+        if not urls:
+            return {}
+
+        # Downloads stay on threads (I/O-bound), while the CPU-bound parsing
+        # is handed to a process pool so multiple CSVs parse in parallel
+        # despite the GIL. Each thread submits its parse as soon as its
+        # download finishes, keeping the two stages pipelined. Results are
+        # collected as they complete, so one slow download does not hold up
+        # the others and the first failure surfaces immediately.
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=min(os.cpu_count() or 1, len(urls)),
+            # Don't fork from this process once the download threads are
+            # live; forking a multi-threaded process is deadlock-prone and
+            # deprecated on Python 3.12.
+            mp_context=multiprocessing.get_context("forkserver"),
+        ) as parse_pool, concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(16, len(urls))
+        ) as executor:
+
+            def _fetch_and_process(url: str) -> tuple:
+                name = Path(url).name
+                data = download_bytes(url, header)
+                parse_future = parse_pool.submit(
+                    process_csv_bytes,
+                    data,
+                    name,
+                    METADATA_KEYS,
+                    DATA_KEYS,
+                    DEFAULT_ENCODING,
+                    DATASET_DTYPES,
                 )
-            }
+                return name, parse_future.result()
+
+            futures = [executor.submit(_fetch_and_process, url) for url in urls]
+            results = dict(
+                future.result()
+                for future in concurrent.futures.as_completed(futures)
+            )
 
         return results
 
@@ -74,21 +141,26 @@ def main(git_token: str, repo_name: str, issue_number: str, config_yml: dict):
             with open(MD_INDEX_PAGE, "w") as md_file:
                 md_file.write(mod_page)
 
-    # GitHub API
-    GIT = Github(git_token)
-    REPO = GIT.get_repo(repo_name)
-    ISSUE = REPO.get_issue(int(issue_number))
+    # GitHub API. Cache responses so workflow re-runs within the expiry
+    # window are served locally instead of re-fetching and burning rate
+    # limit; POST is included so the GraphQL query (keyed on its body) is
+    # cached too. Sessions created before this point (e.g. the download
+    # session) keep using the network directly.
+    requests_cache.install_cache(
+        "/tmp/gh_cache",
+        backend="sqlite",
+        expire_after=300,
+        cache_control=True,
+        allowed_methods=("GET", "HEAD", "POST"),
+    )
+    issue_body = _fetch_issue_body(git_token, repo_name, int(issue_number))
 
     # Check if the issue has a link to a CSV file
-    assert any(
-        re.findall(r"\[.*?\]\((.*?\.csv)\)", ISSUE.body)
-    ), "csv file(s) not found."
+    assert any(_CSV_ANY_RE.findall(issue_body)), "csv file(s) not found."
 
     # Process the CSV file
-    csv_urls = re.findall(r"\[.*?\]\((https://.*?\.csv)\)", ISSUE.body)
-    PTH_FILES = Path(config_yml["github_actions"]["csv_path"])
-    PTH_FILES.mkdir(parents=True, exist_ok=True)
-    csv_processed = _csv_processing(csv_urls, config_yml, PTH_FILES)
+    csv_urls = _CSV_URL_RE.findall(issue_body)
+    csv_processed = _csv_processing(csv_urls, config_yml)
 
     # Markdown processing
     _markdown_creation(config_yml, csv_processed)